@@ -1,98 +1,289 @@
 """Four adversarial fact-checking agents powered by Gemini."""
 import json
+import random
 import re
+import threading
 import time
-
-from google import genai
-from config import get_gemini_api_key, GEMINI_MODEL, SOURCE_SCORE_THRESHOLD
-from search_tools import search_ddg, fetch_url_text
-from source_scorer import score_source
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+from cache import make_key, get_cached, set_cached
+from config import (
+    get_gemini_api_key, GEMINI_MODEL, SOURCE_SCORE_THRESHOLD, LLM_CACHE_TTL,
+    PARALLEL_SUB_CLAIMS, GEMINI_RPM, EMBEDDING_MODEL, MAX_CONCURRENCY,
+    FAST_PATH_JUDGE,
+)
+from search_tools import search_ddg, fetch_url_text, canonical_url
+from source_scorer import score_sources
 
 _client = None
-_MAX_RETRIES = 3
-_BASE_DELAY = 12  # seconds — free tier allows 5 req/min
-_PACE_DELAY = 15  # seconds between calls to stay within rate limit
-_last_call_time = 0
+_client_lock = threading.Lock()
+_MAX_RETRIES = 4
+_BASE_DELAY = 12  # seconds — free tier allows 5 req/min; backoff scale on 429
+_MAX_DELAY = 30  # seconds; cap on a single backoff sleep
+_RATE_WINDOW = 60  # seconds — GEMINI_RPM calls allowed per window
+_call_times = deque()
+_pace_lock = threading.Lock()
+_TEMPERATURE = 0.3
+_REPLAY_CHUNK = 400  # chars per stream_cb call when replaying a cached response
+_SEARCH_TIMEOUT = 8  # seconds before the Researcher stops waiting on searches
+_FETCH_TIMEOUT = 5  # seconds before it stops waiting on page fetches
 
 
 def _get_client():
+    """Process-wide Gemini client, shared across Streamlit reruns and sessions."""
     global _client
     if _client is None:
-        _client = genai.Client(api_key=get_gemini_api_key())
+        # Fan-out workers can race here on the first call of a run
+        with _client_lock:
+            if _client is None:
+                # Imported on first use: google.genai pulls in a large dependency
+                # tree that module import (and every Streamlit rerun) shouldn't pay for.
+                from google import genai
+                _client = genai.Client(api_key=get_gemini_api_key())
     return _client
 
 
-def _pace():
-    """Wait if needed to stay within Gemini free-tier rate limits."""
-    global _last_call_time
-    now = time.time()
-    elapsed = now - _last_call_time
-    if _last_call_time > 0 and elapsed < _PACE_DELAY:
-        time.sleep(_PACE_DELAY - elapsed)
-    _last_call_time = time.time()
+def embed_text(text):
+    """Embedding vector for text, or None if the embedding call fails."""
+    try:
+        client = _get_client()
+        from google.genai import types
+        resp = client.models.embed_content(
+            model=EMBEDDING_MODEL,
+            contents=text,
+            config=types.EmbedContentConfig(output_dimensionality=768),
+        )
+        return list(resp.embeddings[0].values)
+    except Exception:
+        return None
+
+
+def _pace(log_cb=None):
+    """Wait if needed to stay within Gemini free-tier rate limits.
+
+    Rolling-window limiter: up to GEMINI_RPM calls may go out back to back
+    (or concurrently); callers only wait once the last minute's budget is spent.
+    """
+    with _pace_lock:
+        now = time.monotonic()
+        while _call_times and now - _call_times[0] >= _RATE_WINDOW:
+            _call_times.popleft()
+        if len(_call_times) >= GEMINI_RPM:
+            delay = _RATE_WINDOW - (now - _call_times[0])
+            if log_cb:
+                log_cb("Rate limit budget spent, waiting %ds..." % round(delay))
+            time.sleep(delay)
+            _call_times.popleft()
+        _call_times.append(time.monotonic())
+
+
+def _backoff(attempt, log_cb=None):
+    """Sleep with jittered exponential backoff before retrying a 429.
+
+    Each sleep is at least half its step, so the retries still span most
+    of the per-minute quota window (33-66 s in total over _MAX_RETRIES).
+    """
+    step = min(_BASE_DELAY * 2 ** attempt, _MAX_DELAY)
+    delay = random.uniform(step / 2, step)
+    if log_cb:
+        log_cb("Rate-limited by Gemini, retrying in %ds..." % round(delay))
+    time.sleep(delay)
+
+
+def _cache_key(system_prompt, user_prompt, schema):
+    return make_key(GEMINI_MODEL, system_prompt, user_prompt, _TEMPERATURE, schema)
+
+
+_configs = {}
+
+
+def _gen_config(system_prompt, schema):
+    """Generation config; with a schema, Gemini returns schema-conforming JSON.
+
+    Built once per (system prompt, schema) pair and reused: constructing it
+    validates the whole schema dict into SDK objects.
+    """
+    key = (system_prompt, id(schema))
+    config = _configs.get(key)
+    if config is None:
+        from google.genai import types
+        config = _configs[key] = types.GenerateContentConfig(
+            system_instruction=system_prompt,
+            temperature=_TEMPERATURE,
+            response_mime_type="application/json" if schema else None,
+            response_schema=schema,
+        )
+    return config
 
 
-def _call_gemini(system_prompt, user_prompt):
-    """Call Gemini with pacing and retry on rate limit."""
+def _call_gemini(system_prompt, user_prompt, schema=None):
+    """Call Gemini with caching, pacing and retry on rate limit."""
+    key = _cache_key(system_prompt, user_prompt, schema)
+    cached = get_cached(key, LLM_CACHE_TTL)
+    if cached is not None:
+        return cached
     _pace()
     client = _get_client()
+    from google.genai import errors as genai_errors
     for attempt in range(_MAX_RETRIES):
         try:
             resp = client.models.generate_content(
                 model=GEMINI_MODEL,
                 contents=user_prompt,
-                config=genai.types.GenerateContentConfig(
-                    system_instruction=system_prompt,
-                    temperature=0.3,
-                ),
+                config=_gen_config(system_prompt, schema),
             )
+            if resp.text:
+                set_cached(key, resp.text)
             return resp.text
-        except Exception as e:
-            if "429" in str(e) or "RESOURCE_EXHAUSTED" in str(e):
-                time.sleep(_BASE_DELAY * (attempt + 1))
-            else:
+        except genai_errors.ClientError as e:
+            if e.code != 429:
                 raise
+            if attempt < _MAX_RETRIES - 1:  # no point sleeping before giving up
+                _backoff(attempt)
     raise RuntimeError("Gemini rate limit exceeded after %d retries" % _MAX_RETRIES)
 
 
-def _call_gemini_stream(system_prompt, user_prompt, stream_cb=None):
-    """Call Gemini with streaming, pacing, and retry on rate limit."""
+def _call_gemini_stream(system_prompt, user_prompt, stream_cb=None, schema=None,
+                        log_cb=None):
+    """Call Gemini with streaming, caching, pacing, and retry on rate limit.
+
+    Rate-limit waits are reported through log_cb so the UI doesn't look hung.
+    """
     if stream_cb is None:
-        return _call_gemini(system_prompt, user_prompt)
-    _pace()
+        return _call_gemini(system_prompt, user_prompt, schema)
+    key = _cache_key(system_prompt, user_prompt, schema)
+    cached = get_cached(key, LLM_CACHE_TTL)
+    if cached is not None:
+        # Replay in chunks so the UI still shows the response arriving
+        for i in range(0, len(cached), _REPLAY_CHUNK):
+            stream_cb(cached[i:i + _REPLAY_CHUNK])
+        return cached
+    _pace(log_cb)
     client = _get_client()
+    from google.genai import errors as genai_errors
     for attempt in range(_MAX_RETRIES):
         try:
-            full_text = ""
+            parts = []
             for chunk in client.models.generate_content_stream(
                 model=GEMINI_MODEL,
                 contents=user_prompt,
-                config=genai.types.GenerateContentConfig(
-                    system_instruction=system_prompt,
-                    temperature=0.3,
-                ),
+                config=_gen_config(system_prompt, schema),
             ):
                 if chunk.text:
-                    full_text += chunk.text
+                    parts.append(chunk.text)
                     stream_cb(chunk.text)
+            full_text = "".join(parts)
+            if full_text:
+                set_cached(key, full_text)
             return full_text
-        except Exception as e:
-            if "429" in str(e) or "RESOURCE_EXHAUSTED" in str(e):
-                time.sleep(_BASE_DELAY * (attempt + 1))
-            else:
+        except genai_errors.ClientError as e:
+            if e.code != 429:
                 raise
+            if attempt < _MAX_RETRIES - 1:  # no point sleeping before giving up
+                _backoff(attempt, log_cb)
     raise RuntimeError("Gemini rate limit exceeded after %d retries" % _MAX_RETRIES)
 
 
+def _obj(**props):
+    """Response-schema OBJECT with every property required, in order."""
+    return {
+        "type": "OBJECT",
+        "properties": props,
+        "required": list(props),
+        "property_ordering": list(props),
+    }
+
+
+def _arr(items):
+    return {"type": "ARRAY", "items": items}
+
+
+_STR = {"type": "STRING"}
+_INT = {"type": "INTEGER"}
+_BOOL = {"type": "BOOLEAN"}
+_VERDICT = {
+    "type": "STRING",
+    "enum": ["TRUE", "MOSTLY TRUE", "PARTIALLY TRUE", "MOSTLY FALSE", "FALSE"],
+}
+_STRENGTH = {"type": "STRING", "enum": ["strong", "moderate", "weak"]}
+
+
+def _to_json(obj):
+    """Compact JSON for prompts. Pretty-printing only costs tokens and CPU."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(obj, default=str, ensure_ascii=False, separators=(",", ":"))
+
+
+def _trim(obj, list_cap, str_cap):
+    """Copy obj with lists cut to list_cap items and strings to str_cap chars."""
+    if isinstance(obj, dict):
+        return {k: _trim(v, list_cap, str_cap) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_trim(v, list_cap, str_cap) for v in obj[:list_cap]]
+    if isinstance(obj, str) and len(obj) > str_cap:
+        return obj[:str_cap] + "..."
+    return obj
+
+
+def _prompt_json(obj, budget):
+    """Serialize obj for a prompt in at most budget chars.
+
+    Trims the object before serializing (shrinking until it fits) so large
+    fields are never serialized only to be sliced off, and the model gets
+    well-formed JSON instead of an object cut mid-structure.
+    """
+    list_cap, str_cap = 15, 1500
+    while True:
+        text = _to_json(_trim(obj, list_cap, str_cap))
+        if len(text) <= budget or str_cap <= 100:
+            return text[:budget]
+        list_cap = max(3, list_cap * 2 // 3)
+        str_cap = str_cap * 2 // 3
+
+
+_json_decoder = json.JSONDecoder()
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+_JSON_OBJ_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+
 def _extract_json(text):
-    """Extract JSON object from LLM response text."""
-    match = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", text, re.DOTALL)
+    """Extract JSON object from LLM response text.
+
+    Agents request schema-constrained JSON, so the fast path below is
+    normally a plain decode; the regexes only rescue free-form replies.
+    """
+    # Schema-constrained replies are a bare JSON object: orjson parses
+    # those several times faster than the stdlib decoder.
+    if orjson is not None:
+        try:
+            obj = orjson.loads(text)
+            if isinstance(obj, dict):
+                return obj
+        except orjson.JSONDecodeError:
+            pass
+    # Otherwise decode straight from the first '{'. raw_decode stops at the
+    # end of the object, so fences and trailing prose need no regex pass.
+    start = text.find("{")
+    if start != -1:
+        try:
+            obj, _ = _json_decoder.raw_decode(text, start)
+            if isinstance(obj, dict):
+                return obj
+        except json.JSONDecodeError:
+            pass
+    match = _JSON_FENCE_RE.search(text)
     if match:
         try:
             return json.loads(match.group(1))
         except json.JSONDecodeError:
             pass
-    match = re.search(r"\{.*\}", text, re.DOTALL)
+    match = _JSON_OBJ_RE.search(text)
     if match:
         try:
             return json.loads(match.group(0))
@@ -101,6 +292,41 @@ def _extract_json(text):
     return {"raw_response": text}
 
 
+def _fan_out(fn, items, timeout=None):
+    """Run an I/O-bound fn over items on a thread pool, preserving order.
+
+    With a timeout, items still running after that many seconds come back
+    as None and are left to finish in the background, so one slow host
+    can't hold up the rest.
+
+    Workers must not touch Streamlit, so callers pass no stream/log
+    callbacks into fn and report progress from the calling thread.
+    """
+    items = list(items)
+    if not items:
+        return []
+    pool = ThreadPoolExecutor(max_workers=min(MAX_CONCURRENCY, len(items)))
+    futures = [pool.submit(fn, item) for item in items]
+    done, _ = wait(futures, timeout=timeout)
+    pool.shutdown(wait=False, cancel_futures=True)
+    return [f.result() if f in done else None for f in futures]
+
+
+def _fetch_pages(results):
+    """Fetch page text for search results concurrently, in place.
+
+    Each distinct URL is fetched once, however many results point at it.
+    Returns the number of pages that timed out.
+    """
+    urls = list(dict.fromkeys(r["url"] for r in results if r.get("url")))
+    fetched = dict(zip(urls, _fan_out(fetch_url_text, urls, _FETCH_TIMEOUT)))
+    for r in results:
+        content = fetched.get(r.get("url"))
+        if content:
+            r["fetched_content"] = content[:1500]
+    return sum(1 for content in fetched.values() if content is None)
+
+
 # ─── AGENT 1: THE RESEARCHER ────────────────────────────────────────────
 
 RESEARCHER_PROMPT = """You are THE RESEARCHER — thorough, eager, and comprehensive.
@@ -124,6 +350,34 @@ Return ONLY valid JSON (no markdown fences) in this format:
   ]
 }"""
 
+RESEARCHER_SCHEMA = _obj(
+    sub_claims=_arr(_STR),
+    findings=_arr(_obj(
+        sub_claim=_STR,
+        evidence=_arr(_obj(
+            source_url=_STR, source_title=_STR, snippet=_STR, supports_claim=_BOOL,
+        )),
+    )),
+)
+
+
+# Local query variants: extra recall without an LLM round-trip
+_QUERY_SUFFIXES = ("", " fact check")
+
+
+def _query_variants(claim):
+    return [claim + suffix for suffix in _QUERY_SUFFIXES]
+
+
+def _merge_results(result_lists):
+    """Flatten per-query search results, dropping repeated URLs."""
+    merged = {}
+    for results in result_lists:
+        for r in results or []:  # None: the search timed out
+            url = r.get("url")
+            merged.setdefault(canonical_url(url) if url else r.get("title"), r)
+    return list(merged.values())
+
 
 def run_researcher(claim, stream_cb=None, log_cb=None):
     """Agent 1: Search the web and gather evidence. Single Gemini call."""
@@ -131,16 +385,15 @@ def run_researcher(claim, stream_cb=None, log_cb=None):
         log_cb("Searching the web...")
 
     # Search directly with the claim + a variant — no separate sub-claim call
-    search_results = search_ddg(claim)
+    searches = _fan_out(search_ddg, _query_variants(claim), _SEARCH_TIMEOUT)
+    search_results = _merge_results(searches)
     if log_cb:
         log_cb("Found %d results" % len(search_results))
 
-    # Fetch text from top 3 URLs
-    for r in search_results[:3]:
-        if r.get("url"):
-            content = fetch_url_text(r["url"])
-            if content:
-                r["fetched_content"] = content[:1500]
+    # Fetch text from top 3 URLs in parallel — pure network wait
+    timed_out = _fetch_pages(search_results[:3]) + searches.count(None)
+    if timed_out and log_cb:
+        log_cb("%d searches/pages timed out; continuing with partial evidence" % timed_out)
 
     all_results = [{"sub_claim": claim, "search_results": search_results}]
 
@@ -148,17 +401,19 @@ def run_researcher(claim, stream_cb=None, log_cb=None):
         log_cb("Synthesizing findings...")
 
     # Single Gemini call: break into sub-claims AND synthesize (CALL 1 of 4)
-    synth_prompt = (
-        "Claim: " + claim + "\n\n"
-        "Web search results:\n" +
-        json.dumps(all_results, indent=2, default=str)[:12000] +
+    synth_prompt = "".join([
+        "Claim: ", claim, "\n\n",
+        "Web search results:\n", _prompt_json(all_results, 12000),
         "\n\nFirst identify the verifiable sub-claims, then analyze "
-        "these results and produce your findings JSON."
-    )
-    response = _call_gemini_stream(RESEARCHER_PROMPT, synth_prompt, stream_cb)
+        "these results and produce your findings JSON.",
+    ])
+    response = _call_gemini_stream(RESEARCHER_PROMPT, synth_prompt, stream_cb,
+                                   RESEARCHER_SCHEMA, log_cb)
     result = _extract_json(response)
     if "sub_claims" not in result:
         result["sub_claims"] = [claim]
+    if timed_out:
+        result["partial_evidence"] = True
     return result
 
 
@@ -188,33 +443,87 @@ Return ONLY valid JSON (no markdown fences):
   ]
 }"""
 
+SKEPTIC_SCHEMA = _obj(
+    audited_findings=_arr(_obj(
+        sub_claim=_STR,
+        accepted_sources=_arr(_obj(url=_STR, title=_STR, score=_INT, snippet=_STR)),
+        rejected_sources=_arr(_obj(url=_STR, reason=_STR)),
+        contradictions=_arr(_STR),
+    )),
+)
+
+
+_SKEPTIC_INSTRUCTION = (
+    "\n\nAudit these sources. Reject anything with score < %d." % SOURCE_SCORE_THRESHOLD
+)
+
+
+def _unique_evidence(evidence):
+    """Evidence with repeated URLs (after canonicalization) and empty
+    entries dropped — no point paying tokens to audit them twice."""
+    seen = set()
+    unique = []
+    for ev in evidence:
+        url = ev.get("source_url", "")
+        if not url and not ev.get("snippet"):
+            continue
+        key = canonical_url(url) if url else ev.get("snippet")
+        if key not in seen:
+            seen.add(key)
+            unique.append(ev)
+    return unique
+
+
+def _skeptic_payload(findings):
+    """All sub-claims and their scored sources as one compact batch.
+
+    Only the fields the Skeptic audits are sent, named as in its output
+    schema, so every source is audited in the single call.
+    """
+    return [
+        {
+            "sub_claim": f.get("sub_claim", ""),
+            "sources": [
+                {
+                    "url": ev.get("source_url", ""),
+                    "title": ev.get("source_title", ""),
+                    "snippet": ev.get("snippet", ""),
+                    "supports_claim": ev.get("supports_claim"),
+                    "score": ev.get("credibility_score"),
+                    "tier": ev.get("credibility_tier"),
+                }
+                for ev in _unique_evidence(f.get("evidence", []))
+            ],
+        }
+        for f in findings
+    ]
+
 
 def run_skeptic(researcher_output, stream_cb=None, log_cb=None):
     """Agent 2: Audit sources for credibility. Single Gemini call (CALL 2 of 4)."""
     findings = researcher_output.get("findings", [])
-    for finding in findings:
-        for ev in finding.get("evidence", []):
-            url = ev.get("source_url", "")
-            sc = score_source(url)
-            ev["credibility_score"] = sc["score"]
-            ev["credibility_tier"] = sc["tier"]
-            ev["domain"] = sc["domain"]
-            if log_cb:
-                status = "ACCEPTED" if sc["score"] >= SOURCE_SCORE_THRESHOLD else "REJECTED"
-                log_cb("Scoring %s → %d/10 (Tier %s) — %s" % (
-                    sc["domain"][:30], sc["score"], sc["tier"], status
-                ))
+    evidence = [ev for finding in findings for ev in finding.get("evidence", [])]
+    scores = score_sources([ev.get("source_url", "") for ev in evidence])
+    for ev, sc in zip(evidence, scores):
+        ev["credibility_score"] = sc["score"]
+        ev["credibility_tier"] = sc["tier"]
+        ev["domain"] = sc["domain"]
+        if log_cb:
+            status = "ACCEPTED" if sc["score"] >= SOURCE_SCORE_THRESHOLD else "REJECTED"
+            log_cb("Scoring %s → %d/10 (Tier %s) — %s" % (
+                sc["domain"][:30], sc["score"], sc["tier"], status
+            ))
 
     if log_cb:
         log_cb("Analyzing source quality...")
 
-    prompt = (
-        "Researcher's findings with credibility scores:\n" +
-        json.dumps(researcher_output, indent=2, default=str)[:12000] +
-        "\n\nAudit these sources. Reject anything with score < " +
-        str(SOURCE_SCORE_THRESHOLD) + "."
-    )
-    response = _call_gemini_stream(SKEPTIC_PROMPT, prompt, stream_cb)
+    prompt = "".join([
+        "Researcher's findings with credibility scores:\n",
+        _prompt_json(_skeptic_payload(findings) if findings else researcher_output, 12000),
+        _SKEPTIC_INSTRUCTION,
+    ])
+    response = _call_gemini_stream(SKEPTIC_PROMPT, prompt, stream_cb, SKEPTIC_SCHEMA,
+                                   log_cb)
     return _extract_json(response)
 
 
@@ -239,19 +548,59 @@ Return ONLY valid JSON (no markdown fences):
   "logical_issues": ["..."]
 }"""
 
+_POINT = _obj(point=_STR, source=_STR, strength=_STRENGTH)
+ADVERSARY_SCHEMA = _obj(
+    for_evidence=_arr(_POINT),
+    against_evidence=_arr(_POINT),
+    critiques=_arr(_STR),
+    missing_evidence=_arr(_STR),
+    logical_issues=_arr(_STR),
+)
+
+
+def _adversary_sub_claim(claim, audited_finding):
+    """Critique of a single audited sub-claim. Runs on a worker thread."""
+    prompt = "".join([
+        "Original claim: ", claim, "\n\n",
+        "Sub-claim: ", str(audited_finding.get("sub_claim", "")), "\n\n",
+        "Skeptic's audited findings for this sub-claim:\n",
+        _prompt_json(audited_finding, 6000),
+        "\n\nNow tear this sub-claim apart. Find every weakness.",
+    ])
+    return _extract_json(_call_gemini(ADVERSARY_PROMPT, prompt, ADVERSARY_SCHEMA))
+
+
+def _merge_adversary(outputs):
+    """Concatenate per-sub-claim Adversary outputs into one."""
+    merged = {key: [] for key in ADVERSARY_SCHEMA["properties"]}
+    for out in outputs:
+        for key, items in merged.items():
+            items.extend(out.get(key, []))
+    return merged
+
 
 def run_adversary(claim, skeptic_output, stream_cb=None, log_cb=None):
-    """Agent 3: Argue against the claim. Single Gemini call (CALL 3 of 4)."""
+    """Agent 3: Argue against the claim. Single Gemini call (CALL 3 of 4).
+
+    With PARALLEL_SUB_CLAIMS, each sub-claim is critiqued in its own
+    concurrent call and the results are merged.
+    """
     if log_cb:
         log_cb("Stress-testing evidence...")
 
-    prompt = (
-        "Original claim: " + claim + "\n\n"
-        "Skeptic's audited findings:\n" +
-        json.dumps(skeptic_output, indent=2, default=str)[:12000] +
-        "\n\nNow tear this apart. Find every weakness."
-    )
-    response = _call_gemini_stream(ADVERSARY_PROMPT, prompt, stream_cb)
+    audited = skeptic_output.get("audited_findings", [])
+    if PARALLEL_SUB_CLAIMS and len(audited) > 1:
+        if log_cb:
+            log_cb("Stress-testing %d sub-claims in parallel..." % len(audited))
+        return _merge_adversary(_fan_out(lambda f: _adversary_sub_claim(claim, f), audited))
+
+    prompt = "".join([
+        "Original claim: ", claim, "\n\n",
+        "Skeptic's audited findings:\n", _prompt_json(skeptic_output, 12000),
+        "\n\nNow tear this apart. Find every weakness.",
+    ])
+    response = _call_gemini_stream(ADVERSARY_PROMPT, prompt, stream_cb, ADVERSARY_SCHEMA,
+                                   log_cb)
     return _extract_json(response)
 
 
@@ -280,19 +629,245 @@ Return ONLY valid JSON (no markdown fences):
   "key_sources": [{"url": "...", "title": "...", "why_important": "..."}]
 }"""
 
+SUB_VERDICT_SCHEMA = _obj(sub_claim=_STR, verdict=_VERDICT, confidence=_INT, reasoning=_STR)
+JUDGE_SCHEMA = _obj(
+    sub_verdicts=_arr(SUB_VERDICT_SCHEMA),
+    overall_verdict=_VERDICT,
+    overall_confidence=_INT,
+    reasoning=_STR,
+    key_sources=_arr(_obj(url=_STR, title=_STR, why_important=_STR)),
+)
+
+
+SUB_JUDGE_PROMPT = """You are THE JUDGE — balanced, judicial, fair, and measured.
+Weigh the evidence for ONE sub-claim impartially and deliver its verdict.
+
+Verdict scale:
+- TRUE (confidence 80-100%)
+- MOSTLY TRUE (confidence 60-80%)
+- PARTIALLY TRUE (confidence 40-60%)
+- MOSTLY FALSE (confidence 20-40%)
+- FALSE (confidence 0-20%)
+
+Return ONLY valid JSON (no markdown fences):
+{"sub_claim": "...", "verdict": "...", "confidence": 85, "reasoning": "..."}"""
+
+
+# Appended to Judge prompts when the Researcher ran out of time
+_PARTIAL_EVIDENCE_NOTE = (
+    "\n\nNote: some searches or page fetches timed out, so this evidence is "
+    "incomplete. Let that temper your confidence."
+)
+
+
+def _judge_sub_claim(claim, audited_finding, adversary_output, partial_evidence=False):
+    """Verdict for a single audited sub-claim. Runs on a worker thread."""
+    prompt = "".join([
+        "Original claim: ", claim, "\n\n",
+        "Sub-claim: ", str(audited_finding.get("sub_claim", "")), "\n\n",
+        "Audited sources for this sub-claim:\n", _prompt_json(audited_finding, 4000),
+        "\n\nAdversary's analysis:\n", _prompt_json(adversary_output, 4000),
+        _PARTIAL_EVIDENCE_NOTE if partial_evidence else "",
+        "\n\nDeliver your verdict on this sub-claim only.",
+    ])
+    result = _extract_json(_call_gemini(SUB_JUDGE_PROMPT, prompt, SUB_VERDICT_SCHEMA))
+    result.setdefault("sub_claim", audited_finding.get("sub_claim", ""))
+    return result
+
+
+_VERDICT_BANDS = (
+    (80, "TRUE"), (60, "MOSTLY TRUE"), (40, "PARTIALLY TRUE"),
+    (20, "MOSTLY FALSE"), (0, "FALSE"),
+)
+
+
+def _verdict_for(confidence):
+    """Map a 0-100 confidence onto the Judge's verdict scale."""
+    for floor, verdict in _VERDICT_BANDS:
+        if confidence >= floor:
+            return verdict
+    return "FALSE"
+
+
+def _top_sources(skeptic_output, k=3):
+    """Highest-scoring accepted sources, formatted as Judge key_sources."""
+    accepted = [
+        src
+        for f in skeptic_output.get("audited_findings", [])
+        for src in f.get("accepted_sources", [])
+    ]
+    accepted.sort(key=lambda src: src.get("score", 0), reverse=True)
+    return [
+        {
+            "url": src.get("url", ""),
+            "title": src.get("title", ""),
+            "why_important": "Accepted by the Skeptic (score %s/10)" % src.get("score", "?"),
+        }
+        for src in accepted[:k]
+    ]
+
+
+def _aggregate_verdict(sub_verdicts, skeptic_output):
+    """Overall verdict from sub-verdicts in Python, without another LLM call."""
+    overall = round(sum(sv["confidence"] for sv in sub_verdicts) / len(sub_verdicts))
+    return {
+        "sub_verdicts": sub_verdicts,
+        "overall_verdict": _verdict_for(overall),
+        "overall_confidence": overall,
+        "reasoning": "Combined from %d independently judged sub-claims: %s." % (
+            len(sub_verdicts),
+            "; ".join('"%s" is %s (%d%%)' % (
+                sv.get("sub_claim", ""), sv.get("verdict", "?"), sv["confidence"]
+            ) for sv in sub_verdicts),
+        ),
+        "key_sources": _top_sources(skeptic_output),
+    }
+
+
+def _fast_verdict(adversary_output, skeptic_output, partial_evidence=False):
+    """Verdict computed locally when the evidence is unambiguous, else None.
+
+    Unambiguous means: the for/against evidence is over 80% one-sided, the
+    Adversary raised no critiques or logical issues, the accepted sources
+    average at least SOURCE_SCORE_THRESHOLD + 2, and no searches or page
+    fetches timed out.
+    """
+    if partial_evidence:
+        return None
+    if adversary_output.get("critiques") or adversary_output.get("logical_issues"):
+        return None
+    n_for = len(adversary_output.get("for_evidence", []))
+    n_against = len(adversary_output.get("against_evidence", []))
+    agreement = (n_for - n_against) / max(1, n_for + n_against)
+    scores = [
+        src.get("score", 0)
+        for f in skeptic_output.get("audited_findings", [])
+        for src in f.get("accepted_sources", [])
+        if isinstance(src.get("score"), int)
+    ]
+    if abs(agreement) <= 0.8 or not scores:
+        return None
+    if sum(scores) / len(scores) < SOURCE_SCORE_THRESHOLD + 2:
+        return None
+    confidence = round(50 + 50 * agreement)
+    return {
+        "sub_verdicts": [],
+        "overall_verdict": _verdict_for(confidence),
+        "overall_confidence": confidence,
+        "reasoning": "The evidence is one-sided: %d point(s) for and %d against, "
+                     "from %d accepted sources averaging %.1f/10, with no critiques "
+                     "from the Adversary." % (
+                         n_for, n_against, len(scores), sum(scores) / len(scores)),
+        "key_sources": _top_sources(skeptic_output),
+    }
+
+
+def run_judge(claim, adversary_output, skeptic_output, stream_cb=None, log_cb=None,
+              partial_evidence=False):
+    """Agent 4: Deliver final verdict. Single Gemini call (CALL 4 of 4).
+
+    With PARALLEL_SUB_CLAIMS, each sub-claim is instead judged in its own
+    concurrent call and the overall verdict is their mean confidence.
+    With FAST_PATH_JUDGE, unambiguous evidence is ruled on without a call.
+    partial_evidence (from the Researcher) is passed on to the model.
+    """
+    if FAST_PATH_JUDGE:
+        fast = _fast_verdict(adversary_output, skeptic_output, partial_evidence)
+        if fast:
+            if log_cb:
+                log_cb("Evidence is unambiguous; ruling without deliberation")
+            return fast
 
-def run_judge(claim, adversary_output, skeptic_output, stream_cb=None, log_cb=None):
-    """Agent 4: Deliver final verdict. Single Gemini call (CALL 4 of 4)."""
     if log_cb:
         log_cb("Weighing all evidence...")
 
-    prompt = (
-        "Original claim: " + claim + "\n\n"
-        "Audited sources (from Skeptic):\n" +
-        json.dumps(skeptic_output, indent=2, default=str)[:6000] +
-        "\n\nAdversary's analysis:\n" +
-        json.dumps(adversary_output, indent=2, default=str)[:6000] +
-        "\n\nDeliver your verdict."
-    )
-    response = _call_gemini_stream(JUDGE_PROMPT, prompt, stream_cb)
+    audited = skeptic_output.get("audited_findings", [])
+    if PARALLEL_SUB_CLAIMS and len(audited) > 1:
+        if log_cb:
+            log_cb("Judging %d sub-claims in parallel..." % len(audited))
+        sub_verdicts = _fan_out(
+            lambda f: _judge_sub_claim(claim, f, adversary_output, partial_evidence),
+            audited,
+        )
+        if all(isinstance(sv.get("confidence"), int) for sv in sub_verdicts):
+            return _aggregate_verdict(sub_verdicts, skeptic_output)
+        if log_cb:
+            log_cb("Sub-claim verdicts incomplete; judging the claim as a whole...")
+
+    prompt = "".join([
+        "Original claim: ", claim, "\n\n",
+        "Audited sources (from Skeptic):\n", _prompt_json(skeptic_output, 6000),
+        "\n\nAdversary's analysis:\n", _prompt_json(adversary_output, 6000),
+        _PARTIAL_EVIDENCE_NOTE if partial_evidence else "",
+        "\n\nDeliver your verdict.",
+    ])
+    response = _call_gemini_stream(JUDGE_PROMPT, prompt, stream_cb, JUDGE_SCHEMA,
+                                   log_cb)
     return _extract_json(response)
+
+
+# ─── AGENTS 3+4 COMBINED: ADVERSARY THEN JUDGE ──────────────────────────
+
+ADVERSARY_JUDGE_PROMPT = """You play two roles in sequence on the same evidence.
+
+FIRST, as THE ADVERSARY — a devil's advocate and contrarian stress-tester:
+sort the audited evidence into FOR and AGAINST piles; look for contradictions,
+missing context, logical fallacies, cherry-picked data, outdated info, and
+correlation vs causation errors; critique the evidence; identify what's MISSING.
+
+THEN, as THE JUDGE — balanced, judicial, fair, and measured: weigh the
+evidence AND your own adversarial analysis impartially and deliver a verdict.
+
+Verdict scale:
+- TRUE (confidence 80-100%)
+- MOSTLY TRUE (confidence 60-80%)
+- PARTIALLY TRUE (confidence 40-60%)
+- MOSTLY FALSE (confidence 20-40%)
+- FALSE (confidence 0-20%)
+
+Return ONLY valid JSON (no markdown fences), the adversary section first:
+{
+  "adversary": {
+    "for_evidence": [{"point": "...", "source": "...", "strength": "strong/moderate/weak"}],
+    "against_evidence": [{"point": "...", "source": "...", "strength": "strong/moderate/weak"}],
+    "critiques": ["..."],
+    "missing_evidence": ["..."],
+    "logical_issues": ["..."]
+  },
+  "judge": {
+    "sub_verdicts": [
+      {"sub_claim": "...", "verdict": "...", "confidence": 85, "reasoning": "..."}
+    ],
+    "overall_verdict": "MOSTLY TRUE",
+    "overall_confidence": 72,
+    "reasoning": "A clear 2-3 sentence summary of why this verdict was reached.",
+    "key_sources": [{"url": "...", "title": "...", "why_important": "..."}]
+  }
+}"""
+
+ADVERSARY_JUDGE_SCHEMA = _obj(adversary=ADVERSARY_SCHEMA, judge=JUDGE_SCHEMA)
+
+
+def run_adversary_and_judge(claim, skeptic_output, stream_cb=None, log_cb=None,
+                            partial_evidence=False):
+    """Agents 3 and 4 in one Gemini call (CALLS 3+4 of 4 become one).
+
+    The schema orders the adversary section before the judge section, so a
+    streaming caller can tell which agent is speaking from the "judge" key.
+    Returns (adversary_output, judge_output).
+    """
+    if log_cb:
+        log_cb("Stress-testing evidence, then weighing it...")
+
+    prompt = "".join([
+        "Original claim: ", claim, "\n\n",
+        "Skeptic's audited findings:\n", _prompt_json(skeptic_output, 12000),
+        _PARTIAL_EVIDENCE_NOTE if partial_evidence else "",
+        "\n\nNow tear this apart, then deliver your verdict.",
+    ])
+    response = _call_gemini_stream(ADVERSARY_JUDGE_PROMPT, prompt, stream_cb,
+                                   ADVERSARY_JUDGE_SCHEMA, log_cb)
+    result = _extract_json(response)
+    if "adversary" not in result and "judge" not in result:
+        return {}, result  # unparsed: surface raw_response with the verdict
+    return result.get("adversary", {}), result.get("judge", {})
@@ -1,4 +1,7 @@
 """Fact Checker — Multi-Agent Verification Tool (Streamlit UI)."""
+import time
+from functools import lru_cache
+
 import streamlit as st
 from orchestrator import run_pipeline
 
@@ -49,6 +52,26 @@ AGENT_CONFIG = {
 }
 
 
+VERDICT_CARD_HTML = (
+    '<div style="background:%s20;border-left:4px solid %s;padding:16px;border-radius:8px;margin:16px 0">'
+    '<h2 style="color:%s;margin:0">%s</h2>'
+    '<p style="margin:4px 0 0 0;font-size:0.9em">Confidence: <strong>%d%%</strong></p>'
+    '</div>'
+)
+
+SUB_VERDICT_HTML = (
+    '<div style="background:#f8f9fa;padding:12px;border-radius:6px;margin:8px 0;'
+    'border-left:3px solid %s">'
+    '<strong>%s</strong> — <span style="color:%s">%s (%d%%)</span><br>'
+    '<small>%s</small></div>'
+)
+
+EVIDENCE_LINE = "- **[%s]** %s (%s)"
+
+STREAM_RENDER_INTERVAL = 0.05  # seconds between stream redraws (~20 Hz)
+
+
+@lru_cache(maxsize=64)
 def get_verdict_style(verdict):
     v = (verdict or "").upper().strip()
     return VERDICT_STYLES.get(v, ("#6b7280", "help-circle"))
@@ -69,6 +92,7 @@ if claim:
     placeholders = {} # agent_name -> (log_placeholder, stream_placeholder)
     handovers = {}    # agent_name -> st.empty for handover text
     stream_buffers = {}  # agent_name -> accumulated stream text
+    last_render = {}     # agent_name -> monotonic time of last stream redraw
 
     for name in agent_order:
         cfg = AGENT_CONFIG[name]
@@ -77,12 +101,21 @@ if claim:
 
     current_agent = {"name": None}
 
+    def render_stream(agent):
+        # Truncate display to last 2000 chars to keep UI responsive
+        display = stream_buffers[agent]
+        if len(display) > 2000:
+            display = "..." + display[-2000:]
+        placeholders[agent][1].code(display, language=None)
+        last_render[agent] = time.monotonic()
+
     def event_callback(agent, event, data=""):
         cfg = AGENT_CONFIG.get(agent, {})
 
         if event == "start":
             current_agent["name"] = agent
             stream_buffers[agent] = ""
+            last_render[agent] = 0.0
             # Re-create inner placeholders each time agent starts
             status_widget = containers[agent]
             status_widget.update(label=cfg.get("label", agent), state="running")
@@ -100,12 +133,10 @@ if claim:
         elif event == "stream":
             if agent in placeholders:
                 stream_buffers[agent] = stream_buffers.get(agent, "") + str(data)
-                # Show accumulated stream in the stream placeholder
-                # Truncate display to last 2000 chars to keep UI responsive
-                display = stream_buffers[agent]
-                if len(display) > 2000:
-                    display = "..." + display[-2000:]
-                placeholders[agent][1].code(display, language=None)
+                # Coalesce chunks: each redraw is a message to the browser,
+                # so redraw at most every STREAM_RENDER_INTERVAL
+                if time.monotonic() - last_render.get(agent, 0.0) >= STREAM_RENDER_INTERVAL:
+                    render_stream(agent)
 
         elif event == "handover":
             handovers[agent].markdown(
@@ -113,6 +144,9 @@ if claim:
             )
 
         elif event == "done":
+            # Flush chunks that arrived since the last throttled redraw
+            if agent in placeholders and stream_buffers.get(agent):
+                render_stream(agent)
             containers[agent].update(
                 label=cfg.get("label", agent),
                 state="complete",
@@ -137,10 +171,7 @@ if results:
 
     # Verdict card
     st.markdown(
-        '<div style="background:%s20;border-left:4px solid %s;padding:16px;border-radius:8px;margin:16px 0">'
-        '<h2 style="color:%s;margin:0">%s</h2>'
-        '<p style="margin:4px 0 0 0;font-size:0.9em">Confidence: <strong>%d%%</strong></p>'
-        '</div>' % (color, color, color, verdict, confidence),
+        VERDICT_CARD_HTML % (color, color, color, verdict, confidence),
         unsafe_allow_html=True,
     )
 
@@ -151,6 +182,13 @@ if results:
     st.markdown("### Reasoning")
     st.write(reasoning)
 
+    # Semantic cache info
+    if results.get("cached_from"):
+        st.info("Reused the verdict for a recently checked similar claim: \"%s\"" % results["cached_from"])
+
+    if results.get("researcher", {}).get("partial_evidence"):
+        st.caption("Some searches or pages timed out; this verdict is based on partial evidence.")
+
     # Retries info
     if results.get("retries", 0) > 0:
         st.info("The Skeptic sent the Researcher back %d time(s) for better sources." % results["retries"])
@@ -159,23 +197,19 @@ if results:
     sub_verdicts = judge.get("sub_verdicts", [])
     if sub_verdicts:
         st.markdown("### Sub-Claim Verdicts")
+        cards = []
         for sv in sub_verdicts:
             sc_color, _ = get_verdict_style(sv.get("verdict", ""))
-            st.markdown(
-                '<div style="background:#f8f9fa;padding:12px;border-radius:6px;margin:8px 0;'
-                'border-left:3px solid %s">'
-                '<strong>%s</strong> — <span style="color:%s">%s (%d%%)</span><br>'
-                '<small>%s</small></div>'
-                % (
-                    sc_color,
-                    sv.get("sub_claim", ""),
-                    sc_color,
-                    sv.get("verdict", "?"),
-                    sv.get("confidence", 0),
-                    sv.get("reasoning", ""),
-                ),
-                unsafe_allow_html=True,
-            )
+            cards.append(SUB_VERDICT_HTML % (
+                sc_color,
+                sv.get("sub_claim", ""),
+                sc_color,
+                sv.get("verdict", "?"),
+                sv.get("confidence", 0),
+                sv.get("reasoning", ""),
+            ))
+        # One markdown element for all cards instead of one per sub-claim
+        st.markdown("\n".join(cards), unsafe_allow_html=True)
 
     # Expandable sections
     st.markdown("---")
@@ -183,24 +217,22 @@ if results:
     with st.expander("Evidence FOR the claim"):
         for_ev = results.get("adversary", {}).get("for_evidence", [])
         if for_ev:
-            for e in for_ev:
-                st.markdown("- **[%s]** %s (%s)" % (
-                    e.get("strength", "?"),
-                    e.get("point", ""),
-                    e.get("source", ""),
-                ))
+            st.markdown("\n".join(EVIDENCE_LINE % (
+                e.get("strength", "?"),
+                e.get("point", ""),
+                e.get("source", ""),
+            ) for e in for_ev))
         else:
             st.write("No supporting evidence found.")
 
     with st.expander("Evidence AGAINST the claim"):
         against_ev = results.get("adversary", {}).get("against_evidence", [])
         if against_ev:
-            for e in against_ev:
-                st.markdown("- **[%s]** %s (%s)" % (
-                    e.get("strength", "?"),
-                    e.get("point", ""),
-                    e.get("source", ""),
-                ))
+            st.markdown("\n".join(EVIDENCE_LINE % (
+                e.get("strength", "?"),
+                e.get("point", ""),
+                e.get("source", ""),
+            ) for e in against_ev))
         else:
             st.write("No counter-evidence found.")
 
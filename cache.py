@@ -0,0 +1,116 @@
+"""Persistent on-disk cache (SQLite) for repeatable API lookups."""
+import hashlib
+import json
+import math
+import sqlite3
+import threading
+import time
+
+from config import CACHE_PATH, LLM_CACHE_TTL, SEARCH_CACHE_TTL
+
+_conn = None
+_lock = threading.Lock()
+stats = {"hits": 0, "misses": 0, "claim_hits": 0, "claim_misses": 0}
+# Rows older than every reader's TTL can never be served again
+_CACHE_MAX_AGE = max(LLM_CACHE_TTL, SEARCH_CACHE_TTL)
+
+
+def _get_conn():
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(CACHE_PATH, check_same_thread=False)
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache "
+            "(key TEXT PRIMARY KEY, value TEXT, created REAL)"
+        )
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS claims "
+            "(claim TEXT, embedding TEXT, results TEXT, created REAL)"
+        )
+        _conn.execute("CREATE INDEX IF NOT EXISTS cache_created ON cache (created)")
+        _conn.execute("CREATE INDEX IF NOT EXISTS claims_created ON claims (created)")
+    return _conn
+
+
+def make_key(*parts):
+    """Build a stable cache key from JSON-serializable parts."""
+    return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+
+def get_cached(key, ttl):
+    """Return the cached string for key, or None if missing/expired."""
+    try:
+        with _lock:
+            row = _get_conn().execute(
+                "SELECT value, created FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+    except Exception:
+        row = None
+    if row is None or time.time() - row[1] > ttl:
+        stats["misses"] += 1
+        return None
+    stats["hits"] += 1
+    return row[0]
+
+
+def set_cached(key, value):
+    """Store a string under key. Cache failures are never fatal."""
+    try:
+        with _lock:
+            conn = _get_conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, created) VALUES (?, ?, ?)",
+                (key, value, time.time()),
+            )
+            conn.execute(
+                "DELETE FROM cache WHERE created < ?", (time.time() - _CACHE_MAX_AGE,)
+            )
+            conn.commit()
+    except Exception:
+        pass
+
+
+def _normalize(vec):
+    norm = math.sqrt(sum(x * x for x in vec)) or 1.0
+    return [x / norm for x in vec]
+
+
+def find_similar_claim(embedding, threshold, ttl):
+    """Return (similarity, results_json) of the closest fresh stored claim.
+
+    Returns None when nothing scores at least threshold (cosine similarity).
+    """
+    query = _normalize(embedding)
+    try:
+        with _lock:
+            rows = _get_conn().execute(
+                "SELECT embedding, results FROM claims WHERE created > ?",
+                (time.time() - ttl,),
+            ).fetchall()
+    except Exception:
+        rows = []
+    best = None
+    for emb, results in rows:
+        sim = sum(a * b for a, b in zip(query, json.loads(emb)))
+        if sim >= threshold and (best is None or sim > best[0]):
+            best = (sim, results)
+    stats["claim_hits" if best else "claim_misses"] += 1
+    return best
+
+
+def store_claim(claim, embedding, results_json, ttl):
+    """Remember a finished fact-check for find_similar_claim.
+
+    Stored claims older than ttl are purged at the same time.
+    """
+    try:
+        with _lock:
+            conn = _get_conn()
+            conn.execute(
+                "INSERT INTO claims (claim, embedding, results, created) VALUES (?, ?, ?, ?)",
+                (claim, json.dumps(_normalize(embedding)), results_json, time.time()),
+            )
+            conn.execute("DELETE FROM claims WHERE created < ?", (time.time() - ttl,))
+            conn.commit()
+    except Exception:
+        pass
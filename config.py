@@ -19,6 +19,34 @@ def get_gemini_api_key():
     return ""
 
 GEMINI_MODEL = "gemini-2.5-flash"
+GEMINI_RPM = 5  # free-tier requests per minute
 SEARCH_RESULTS_PER_QUERY = 5
 SOURCE_SCORE_THRESHOLD = 5
 MAX_RESEARCHER_RETRIES = 2
+# Max concurrent searches/page fetches, and fanned-out sub-claim calls
+MAX_CONCURRENCY = 4
+# Fan the Adversary stage, then the Judge stage, out to one concurrent
+# Gemini call per sub-claim (the Judge's overall verdict is then their
+# average). Shorter outputs for multi-part claims, but N calls per stage
+# instead of one against the rate limit.
+PARALLEL_SUB_CLAIMS = False
+# Skip the Judge's Gemini call when the Adversary's evidence is one-sided
+# (>80% agreement), there are no critiques, and accepted sources average
+# at least SOURCE_SCORE_THRESHOLD + 2. The verdict is then computed locally.
+FAST_PATH_JUDGE = False
+# Run the Adversary and Judge as a single two-section Gemini call: one fewer
+# round-trip and rate-limit slot, but the Judge no longer gets a fresh look.
+COMBINED_ADVERSARY_JUDGE = False
+
+# On-disk cache for Gemini responses (and other repeatable lookups)
+CACHE_PATH = os.path.expanduser("~/.factchecker_cache.db")
+LLM_CACHE_TTL = 24 * 3600  # seconds
+SEARCH_CACHE_TTL = 3600  # seconds; search results go stale faster than verdicts
+
+# Semantic claim cache: reuse a stored verdict for near-duplicate claims.
+# Claims differing only by a number, date or negation can embed almost
+# identically and be handed each other's verdict, so it is off by default.
+SEMANTIC_CLAIM_CACHE = False
+EMBEDDING_MODEL = "gemini-embedding-001"
+CLAIM_CACHE_SIMILARITY = 0.95  # cosine similarity
+CLAIM_CACHE_TTL = 24 * 3600  # seconds
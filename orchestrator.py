@@ -1,9 +1,23 @@
 """Orchestrator: manages the 4-agent fact-checking pipeline.
 
-Designed for exactly 4 Gemini API calls, paced to stay within
-the free-tier limit of 5 requests per minute.
+By default one Gemini call per agent (4 in total), paced to stay within
+the free-tier limit of 5 requests per minute. Config flags change the
+count: PARALLEL_SUB_CLAIMS fans the Adversary and Judge out per sub-claim,
+COMBINED_ADVERSARY_JUDGE merges them into one call, FAST_PATH_JUDGE can
+skip the Judge's call, and SEMANTIC_CLAIM_CACHE adds an embedding call
+that may answer a near-duplicate claim from the cache instead.
 """
-from agents import run_researcher, run_skeptic, run_adversary, run_judge
+import json
+
+from agents import (
+    run_researcher, run_skeptic, run_adversary, run_judge, run_adversary_and_judge,
+    embed_text,
+)
+from cache import find_similar_claim, store_claim
+from config import (
+    SEMANTIC_CLAIM_CACHE, CLAIM_CACHE_SIMILARITY, CLAIM_CACHE_TTL,
+    COMBINED_ADVERSARY_JUDGE,
+)
 
 
 def run_pipeline(claim, callback=None):
@@ -29,6 +43,22 @@ def run_pipeline(claim, callback=None):
             emit(agent_name, "log", msg)
         return stream_cb, log_cb
 
+    # ── Semantic cache: reuse the verdict of a near-identical past claim ──
+    embedding = embed_text(claim) if SEMANTIC_CLAIM_CACHE else None
+    hit = None
+    if embedding:
+        hit = find_similar_claim(embedding, CLAIM_CACHE_SIMILARITY, CLAIM_CACHE_TTL)
+    if hit:
+        similarity, cached = hit
+        results = json.loads(cached)
+        results["cached_from"] = results.get("claim", "")
+        results["claim"] = claim
+        emit("researcher", "start")
+        emit("researcher", "log",
+             "Matched a previously checked claim (similarity %.2f)" % similarity)
+        emit("researcher", "done")
+        return results
+
     results = {"claim": claim}
 
     # ── Agent 1: Researcher (Gemini call 1 of 4) ──
@@ -51,6 +81,8 @@ def run_pipeline(claim, callback=None):
     s_cb, l_cb = make_cbs("skeptic")
     skeptic_out = run_skeptic(researcher_out, stream_cb=s_cb, log_cb=l_cb)
     results["skeptic"] = skeptic_out
+    # The Skeptic's payload only carries sources; tell the Judge directly
+    partial = bool(researcher_out.get("partial_evidence"))
 
     audited = skeptic_out.get("audited_findings", [])
     accepted = sum(len(f.get("accepted_sources", [])) for f in audited)
@@ -59,24 +91,66 @@ def run_pipeline(claim, callback=None):
     emit("skeptic", "handover",
          "%d accepted, %d rejected → Adversary" % (accepted, rejected))
 
-    # ── Agent 3: Adversary (Gemini call 3 of 4) ──
-    emit("adversary", "start")
-    s_cb, l_cb = make_cbs("adversary")
-    adversary_out = run_adversary(claim, skeptic_out, stream_cb=s_cb, log_cb=l_cb)
-    results["adversary"] = adversary_out
-
-    n_for = len(adversary_out.get("for_evidence", []))
-    n_against = len(adversary_out.get("against_evidence", []))
-    n_critiques = len(adversary_out.get("critiques", []))
-    emit("adversary", "done")
-    emit("adversary", "handover",
-         "%d for, %d against, %d critiques → Judge" % (n_for, n_against, n_critiques))
-
-    # ── Agent 4: Judge (Gemini call 4 of 4) ──
-    emit("judge", "start")
-    s_cb, l_cb = make_cbs("judge")
-    judge_out = run_judge(claim, adversary_out, skeptic_out, stream_cb=s_cb, log_cb=l_cb)
-    results["judge"] = judge_out
-    emit("judge", "done")
+    if COMBINED_ADVERSARY_JUDGE:
+        # ── Agents 3+4: Adversary then Judge in one Gemini call (3 of 3) ──
+        emit("adversary", "start")
+        phase = {"agent": "adversary", "tail": ""}
+
+        def stream_cb(chunk):
+            # The adversary section streams first; the "judge" key marks
+            # where the Judge starts speaking.
+            if phase["agent"] == "adversary":
+                # Only the new chunk plus a key-length tail can hold a new match
+                window = phase["tail"] + chunk
+                phase["tail"] = window[-6:]
+                if '"judge"' in window:
+                    emit("adversary", "done")
+                    emit("judge", "start")
+                    phase["agent"] = "judge"
+            emit(phase["agent"], "stream", chunk)
+
+        def log_cb(msg):
+            emit(phase["agent"], "log", msg)
+
+        adversary_out, judge_out = run_adversary_and_judge(
+            claim, skeptic_out, stream_cb=stream_cb, log_cb=log_cb,
+            partial_evidence=partial,
+        )
+        if phase["agent"] == "adversary":
+            emit("adversary", "done")
+            emit("judge", "start")
+        results["adversary"] = adversary_out
+        results["judge"] = judge_out
+        emit("adversary", "handover",
+             "%d for, %d against, %d critiques → Judge" % (
+                 len(adversary_out.get("for_evidence", [])),
+                 len(adversary_out.get("against_evidence", [])),
+                 len(adversary_out.get("critiques", [])),
+             ))
+        emit("judge", "done")
+    else:
+        # ── Agent 3: Adversary (Gemini call 3 of 4) ──
+        emit("adversary", "start")
+        s_cb, l_cb = make_cbs("adversary")
+        adversary_out = run_adversary(claim, skeptic_out, stream_cb=s_cb, log_cb=l_cb)
+        results["adversary"] = adversary_out
+
+        n_for = len(adversary_out.get("for_evidence", []))
+        n_against = len(adversary_out.get("against_evidence", []))
+        n_critiques = len(adversary_out.get("critiques", []))
+        emit("adversary", "done")
+        emit("adversary", "handover",
+             "%d for, %d against, %d critiques → Judge" % (n_for, n_against, n_critiques))
+
+        # ── Agent 4: Judge (Gemini call 4 of 4) ──
+        emit("judge", "start")
+        s_cb, l_cb = make_cbs("judge")
+        judge_out = run_judge(claim, adversary_out, skeptic_out, stream_cb=s_cb, log_cb=l_cb,
+                              partial_evidence=partial)
+        results["judge"] = judge_out
+        emit("judge", "done")
+
+    if embedding and judge_out.get("overall_verdict"):
+        store_claim(claim, embedding, json.dumps(results, default=str), CLAIM_CACHE_TTL)
 
     return results
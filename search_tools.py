@@ -1,22 +1,91 @@
 """DuckDuckGo search and URL content fetching."""
-import re
-import urllib.request
-import urllib.error
+import json
 from html.parser import HTMLParser
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 try:
     from ddgs import DDGS
 except ImportError:
     from duckduckgo_search import DDGS
-from config import SEARCH_RESULTS_PER_QUERY
+try:
+    from selectolax.parser import HTMLParser as _FastHTMLParser
+except ImportError:
+    _FastHTMLParser = None
+from cache import make_key, get_cached, set_cached
+from config import SEARCH_RESULTS_PER_QUERY, SEARCH_CACHE_TTL
+
+
+def _make_adapter():
+    """Shared keep-alive connection pool so repeat hosts skip the TCP/TLS handshake."""
+    retry = Retry(
+        total=2,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        respect_retry_after_header=False,
+    )
+    return HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=retry)
+
+
+# Only the adapter is shared: its urllib3 pool is thread-safe, whereas a
+# Session (and its cookie jar) is not, and must not leak cookies between users
+_adapter = _make_adapter()
+
+
+def _new_session():
+    """Throwaway session on the shared pool, with its own empty cookie jar.
+
+    Never close it: Session.close() would close the shared adapter too.
+    """
+    session = requests.Session()
+    session.headers["User-Agent"] = "Mozilla/5.0"
+    session.mount("http://", _adapter)
+    session.mount("https://", _adapter)
+    return session
+
+
+_MAX_PAGE_BYTES = 512 * 1024  # plenty for 3000 chars of text; skips huge pages
+# Links that are obviously not web pages; not worth a request
+_BINARY_SUFFIXES = (".pdf", ".jpg", ".jpeg", ".png", ".gif", ".mp4", ".mp3", ".zip")
+
+_TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid")
+
+
+def canonical_url(url):
+    """URL normalized for deduplication: lowercase host, no tracking
+    parameters, fragment, or trailing slash."""
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url
+    query = urlencode([
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(_TRACKING_PARAMS)
+    ])
+    return urlunsplit((
+        parts.scheme.lower(), parts.netloc.lower(),
+        parts.path.rstrip("/"), query, "",
+    ))
+
+
+class _StopParsing(Exception):
+    """Raised by _TextExtractor once it has collected enough text."""
 
 
 class _TextExtractor(HTMLParser):
-    """Simple HTML to text converter."""
-    def __init__(self):
+    """Simple HTML to text converter.
+
+    With a budget, parsing stops (via _StopParsing) once that many chars of
+    text are collected, so huge pages cost no more than small ones.
+    """
+    def __init__(self, budget=None):
         super().__init__()
         self._text = []
         self._skip = False
+        self._remaining = budget
 
     def handle_starttag(self, tag, attrs):
         if tag in ("script", "style", "noscript"):
@@ -27,18 +96,34 @@ class _TextExtractor(HTMLParser):
             self._skip = False
 
     def handle_data(self, data):
-        if not self._skip:
-            self._text.append(data)
+        if self._skip:
+            return
+        self._text.append(data)
+        if self._remaining is not None:
+            # Whitespace collapses later, so count text as it will end up
+            words = data.split()
+            if words:
+                self._remaining -= sum(map(len, words)) + len(words)
+            if self._remaining < 0:
+                raise _StopParsing
 
     def get_text(self):
         return " ".join(self._text)
 
 
 def search_ddg(query, max_results=SEARCH_RESULTS_PER_QUERY):
-    """Search DuckDuckGo and return list of {title, url, snippet}."""
+    """Search DuckDuckGo and return list of {title, url, snippet}.
+
+    Successful results are cached on disk for SEARCH_CACHE_TTL, keyed by
+    the whitespace/case-normalized query.
+    """
+    key = make_key("ddg", " ".join(query.lower().split()), max_results)
+    cached = get_cached(key, SEARCH_CACHE_TTL)
+    if cached is not None:
+        return json.loads(cached)
     try:
         results = list(DDGS().text(query, max_results=max_results))
-        return [
+        results = [
             {
                 "title": r.get("title", ""),
                 "url": r.get("href", ""),
@@ -46,20 +131,47 @@ def search_ddg(query, max_results=SEARCH_RESULTS_PER_QUERY):
             }
             for r in results
         ]
+        set_cached(key, json.dumps(results))
+        return results
     except Exception as e:
         return [{"title": "Search error", "url": "", "snippet": str(e)}]
 
 
+def _html_to_text(html, max_chars=None):
+    """Visible text of an HTML page; uses selectolax's C parser if installed.
+
+    The pure-Python fallback stops parsing after about max_chars of text.
+    """
+    if _FastHTMLParser is not None:
+        tree = _FastHTMLParser(html)
+        for node in tree.css("script,style,noscript"):
+            node.decompose()
+        return tree.body.text(separator=" ") if tree.body else ""
+    parser = _TextExtractor(max_chars)
+    try:
+        parser.feed(html)
+    except _StopParsing:
+        pass
+    return parser.get_text()
+
+
 def fetch_url_text(url, max_chars=3000):
     """Fetch a URL and return extracted text (truncated)."""
+    if url.split("?", 1)[0].split("#", 1)[0].lower().endswith(_BINARY_SUFFIXES):
+        return ""
     try:
-        req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
-        with urllib.request.urlopen(req, timeout=8) as resp:
-            html = resp.read().decode("utf-8", errors="ignore")
-        parser = _TextExtractor()
-        parser.feed(html)
-        text = parser.get_text()
-        text = re.sub(r"\s+", " ", text).strip()
+        # Stream and read at most _MAX_PAGE_BYTES: pages are truncated to
+        # max_chars anyway, so there's no point downloading or parsing more.
+        with _new_session().get(url, timeout=(3, 8), stream=True) as resp:
+            resp.raise_for_status()
+            # PDFs, images etc. would only decode to binary noise
+            content_type = resp.headers.get("Content-Type", "text/html")
+            content_type = content_type.split(";", 1)[0].strip().lower()
+            if not content_type.startswith("text/") and content_type != "application/xhtml+xml":
+                return ""
+            raw = resp.raw.read(_MAX_PAGE_BYTES, decode_content=True)
+        text = _html_to_text(raw.decode("utf-8", errors="ignore"), max_chars)
+        text = " ".join(text.split())
         return text[:max_chars]
     except Exception:
         return ""
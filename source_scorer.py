@@ -1,6 +1,7 @@
 """Source credibility scoring based on domain tiers and recency."""
 import re
-from datetime import datetime, timedelta
+from datetime import date, datetime
+from functools import lru_cache
 from urllib.parse import urlparse
 
 # Domain tier lists
@@ -29,71 +30,107 @@ TIER_3 = {
 GOV_EDU_TLDS = {".gov", ".edu", ".ac.uk", ".gov.in", ".nic.in"}
 
 
+# scheme://host[:port] followed by a path/query/fragment or the end; URLs
+# with userinfo, IPv6 hosts etc. don't match and go through urlparse
+_HOST_RE = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.\-]*://([^/?#@\[\]\s:]+)(?::\d*)?(?=[/?#]|$)")
+
+
+@lru_cache(maxsize=4096)
 def _get_domain(url):
-    """Extract root domain from URL."""
+    """Extract root domain from URL, memoized per URL."""
     try:
-        host = urlparse(url).hostname or ""
-        host = host.lower()
-        if host.startswith("www."):
-            host = host[4:]
-        return host
+        m = _HOST_RE.match(url)
+        host = m.group(1) if m else urlparse(url).hostname or ""
+        return host.lower().removeprefix("www.")
     except Exception:
         return ""
 
 
+# Lookup tables built once from the tier lists. Later tiers are written
+# first so a domain listed in two tiers keeps its best score.
+_EXACT_SCORE = {
+    **{d: 4 for d in TIER_3},
+    **{d: 7 for d in TIER_2},
+    **{d: 10 for d in TIER_1},
+}
+_GOV_EDU_SUFFIXES = tuple(GOV_EDU_TLDS)
+_TIER_1_PARENTS = tuple("." + d for d in TIER_1)
+_TIER_2_PARENTS = tuple("." + d for d in TIER_2)
+
+
 def _domain_score(domain):
     """Score a domain based on tier membership."""
-    if domain in TIER_1:
-        return 10
-    if domain in TIER_2:
-        return 7
-    if domain in TIER_3:
-        return 4
+    score = _EXACT_SCORE.get(domain)
+    if score:
+        return score
     # Check TLD
-    for tld in GOV_EDU_TLDS:
-        if domain.endswith(tld):
-            return 9
-    # Check if subdomain of a tier-1/2 site
-    for t1 in TIER_1:
-        if domain.endswith("." + t1):
-            return 9
-    for t2 in TIER_2:
-        if domain.endswith("." + t2):
-            return 7
+    if domain.endswith(_GOV_EDU_SUFFIXES):
+        return 9
+    # Check if subdomain of a tier-1/2 site: one C-level endswith per tier
+    if domain.endswith(_TIER_1_PARENTS):
+        return 9
+    if domain.endswith(_TIER_2_PARENTS):
+        return 7
     return 2  # Unknown domain
 
 
-def _recency_modifier(date_str):
-    """Adjust score based on publication recency. Returns -1, 0, or +1."""
+# Each supported date shape is recognized up front, so parsing never
+# tries a format that is bound to fail
+# Only the two ISO shapes strptime accepted; fromisoformat takes far more
+# (e.g. "2024-05-01 10:11"), which must stay unscored as before
+_ISO_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}(?:T\d{2}:\d{2}:\d{2})?$")
+_DATE_FORMATS = (
+    # ISO-like dates with single-digit parts, which fromisoformat rejects
+    (re.compile(r"^\d{4}-\d{1,2}-\d{1,2}$"), "%Y-%m-%d"),
+    (re.compile(r"^\d{4}-\d{1,2}-\d{1,2}T\d{1,2}:\d{1,2}:\d{1,2}$"), "%Y-%m-%dT%H:%M:%S"),
+    (re.compile(r"^[A-Za-z]+\s+\d{1,2},\s+\d{4}$"), "%B %d, %Y"),
+    (re.compile(r"^\d{1,2}\s+[A-Za-z]+\s+\d{4}$"), "%d %B %Y"),
+)
+
+
+def _parse_date(date_str):
+    """Parse a publication date, or None if no known format matches."""
+    s = date_str.strip()[:19]
+    if _ISO_DATE_RE.match(s):
+        try:
+            # C-level ISO parser covers "2024-05-01" and "2024-05-01T10:11:12"
+            # without strptime's regex machinery
+            return datetime.fromisoformat(s)
+        except ValueError:
+            pass  # e.g. month 13; the strptime shapes below reject it too
+    try:
+        for pattern, fmt in _DATE_FORMATS:
+            if pattern.match(s):
+                return datetime.strptime(s, fmt)
+    except ValueError:
+        pass  # right shape, impossible date (e.g. month 13)
+    return None
+
+
+def _recency_modifier(date_str, today=None):
+    """Adjust score based on publication recency. Returns -1, 0, or +1.
+
+    today is the current date's ordinal; batch callers pass it in once.
+    """
     if not date_str:
         return 0
     try:
-        # Try common date formats
-        for fmt in ("%Y-%m-%d", "%B %d, %Y", "%d %B %Y", "%Y-%m-%dT%H:%M:%S"):
-            try:
-                pub_date = datetime.strptime(date_str.strip()[:19], fmt)
-                break
-            except ValueError:
-                continue
-        else:
+        pub_date = _parse_date(date_str)
+        if pub_date is None:
             return 0
-        age = datetime.now() - pub_date
-        if age < timedelta(days=180):
-            return 1
-        elif age > timedelta(days=730):
-            return -1
-        return 0
+        # Whole-day integer arithmetic; no timedelta objects per call
+        if today is None:
+            today = date.today().toordinal()
+        age = today - pub_date.toordinal()
+        return (age < 180) - (age > 730)
     except Exception:
         return 0
 
 
-def score_source(url, date_str=""):
-    """Score a source. Returns dict with score (0-10), tier, domain, details."""
-    domain = _get_domain(url)
+@lru_cache(maxsize=1024)
+def _domain_tier(domain):
+    """Base score and tier label for a domain, memoized per domain."""
     base = _domain_score(domain)
-    recency = _recency_modifier(date_str)
-    final = max(0, min(10, base + recency))
-
     if base >= 9:
         tier = "Tier 1 - Highly Credible"
     elif base >= 6:
@@ -102,6 +139,15 @@ def score_source(url, date_str=""):
         tier = "Tier 3 - Low Credibility"
     else:
         tier = "Tier 4 - Unreliable/Unknown"
+    return base, tier
+
+
+def score_source(url, date_str="", today=None):
+    """Score a source. Returns dict with score (0-10), tier, domain, details."""
+    domain = _get_domain(url)
+    base, tier = _domain_tier(domain)
+    recency = _recency_modifier(date_str, today)
+    final = max(0, min(10, base + recency))
 
     return {
         "domain": domain,
@@ -109,3 +155,16 @@ def score_source(url, date_str=""):
         "tier": tier,
         "recency_modifier": recency,
     }
+
+
+def score_sources(urls, dates=None):
+    """Score many sources at once; same dicts as score_source, in order.
+
+    dates may be shorter than urls (or None); the rest count as undated.
+    The current date is read once for the whole batch.
+    """
+    today = date.today().toordinal()
+    # Missing trailing dates mean "undated", never a dropped URL
+    dates = list(dates or [])
+    dates += [""] * (len(urls) - len(dates))
+    return [score_source(url, d, today) for url, d in zip(urls, dates)]